@@ -72,8 +72,9 @@ except Exception as e:
 
 echo ""
 echo "🌐 Web Dashboard:"
-DASHBOARD_RUNNING=$(ps aux | grep -c "web_dashboard.py" | grep -v grep || echo "0")
-if [ "$DASHBOARD_RUNNING" -gt "1" ]; then
+# start_dashboard.py serves the dashboard in-process, so match either script
+DASHBOARD_RUNNING=$(ps aux | grep -E "web_dashboard.py|start_dashboard.py" | grep -v grep | wc -l)
+if [ "$DASHBOARD_RUNNING" -gt "0" ]; then
     echo "✅ Dashboard running at http://localhost:8080"
 else
     echo "⚠️  Dashboard not running"
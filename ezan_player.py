@@ -5,19 +5,26 @@ Plays different YouTube ezan videos at prayer times according to Diyanet Başkan
 """
 
 import requests
-import schedule
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import heapq
+import itertools
+import threading
+import functools
 import webbrowser
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import datetime, timedelta, time as dt_time
 import subprocess
 import sys
 import os
-from bs4 import BeautifulSoup
 import re
-import threading
+
+try:
+    import orjson  # Optional: faster JSON parsing/serialization
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -29,20 +36,120 @@ logging.basicConfig(
     ]
 )
 
+# Volume percentage in raw `amixer get Master` output
+_AMIXER_RE = re.compile(rb'\[(\d+)%\]')
+
+# Longest the main loop sleeps between checks (seconds), bounds how late a
+# prayer fires after the machine wakes from sleep
+MAX_IDLE_SLEEP = 30
+
+# Turkish month names mapping
+TURKISH_MONTHS = {
+    'January': 'Ocak', 'February': 'Şubat', 'March': 'Mart',
+    'April': 'Nisan', 'May': 'Mayıs', 'June': 'Haziran',
+    'July': 'Temmuz', 'August': 'Ağustos', 'September': 'Eylül',
+    'October': 'Ekim', 'November': 'Kasım', 'December': 'Aralık'
+}
+
+def json_loads(data):
+    """Parse JSON text, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj, indent=False):
+    """Serialize to JSON text (non-ASCII kept as-is), using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+def is_valid_time(time_str):
+    """Check that a string is a 24-hour HH:MM time without going through a regex."""
+    hour, sep, minute = time_str.partition(':')
+    if not sep or len(hour) != 2 or len(minute) != 2:
+        return False
+    if not (hour.isdecimal() and minute.isdecimal()):
+        return False
+    return 0 <= int(hour) < 24 and 0 <= int(minute) < 60
+
+def _stream_table_rows(chunks, encoding=None):
+    """Incrementally parse the prayer times table into lists of cell texts.
+    
+    Only rows with at least 8 columns (the prayer times table layout) are
+    kept. Each row is cleared once read so memory stays flat, and parsing
+    stops as soon as the table holding those rows closes. With no
+    `encoding`, lxml detects it from the document itself.
+    """
+    # Imported lazily: the parser is only needed once a day, so the
+    # long-running daemon doesn't keep it loaded from startup
+    from lxml import etree
+    
+    parser = etree.HTMLPullParser(events=('end',), encoding=encoding)
+    rows = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag == 'tr':
+                cells = [' '.join(''.join(td.itertext()).split()) for td in elem.iterchildren('td')]
+                if len(cells) >= 8:
+                    rows.append(cells)
+                # lxml "fast iter": drop the processed row and its predecessors
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+            elif elem.tag == 'table' and rows:
+                return rows
+    parser.close()
+    return rows
+
 class EzanPlayer:
+    # Set by the dashboard to suppress playback (office mode) without
+    # waiting for the config file to be re-read
+    skip_playback = False
+    
     def __init__(self):
         self.config_file = 'ezan_config.json'
+        self.cache_file = 'ezan_cache.json'
         self.prayer_times = {}
+        self.prayer_times_date = None  # date the current prayer_times belong to
         self.youtube_videos = {}
         self.audio_settings = {}
         self.original_volume = None
+        self._time_cache = {}  # "HH:MM" -> datetime.time, avoids strptime on reschedule
+        self._pending_prayer_times = None  # (date, times) staged before midnight
+        self._heap = []  # (due timestamp, seq, kind, label, callback) job queue
+        self._job_seq = itertools.count()  # tie-breaker so callbacks are never compared
+        self._pending_restores = []  # (due timestamp, volume) processed by the main loop
+        self._restore_lock = threading.Lock()  # the dashboard queues and runs restores from other threads
+        self._config_mtime = 0  # config file mtime the dashboard settings were read at
+        self._dashboard_cfg = {}
+        
+        # Persistent HTTP session so daily refetches reuse the TCP/TLS connection
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        ))
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        })
         self.load_config()
+        self.load_cached_prayer_times()
         
     def load_config(self):
         """Load YouTube video URLs and audio settings from configuration file."""
         try:
             with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+                config = json_loads(f.read())
                 self.youtube_videos = config.get('youtube_videos', {})
                 self.audio_settings = config.get('audio_settings', {
                     'ezan_volume': 75,
@@ -86,18 +193,49 @@ class EzanPlayer:
         }
         
         with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(default_config, f, indent=2, ensure_ascii=False)
+            f.write(json_dumps(default_config, indent=True))
         
         logging.info(f"Created default config file: {self.config_file}")
         logging.info("Please update the YouTube video URLs in the config file!")
         
+    def load_cache(self):
+        """Load the on-disk prayer times cache, or an empty cache if unavailable."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json_loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        except Exception as e:
+            logging.warning(f"Could not read cache file {self.cache_file}: {e}")
+            return {}
+
+    def save_cache(self, cache):
+        """Write the prayer times cache to disk."""
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                f.write(json_dumps(cache))
+        except Exception as e:
+            logging.warning(f"Could not write cache file {self.cache_file}: {e}")
+
+    def load_cached_prayer_times(self):
+        """Load today's prayer times from the cache file if they were already fetched."""
+        cache = self.load_cache()
+        if cache.get('date') == datetime.now().strftime('%Y-%m-%d') and cache.get('prayer_times'):
+            self.prayer_times = cache['prayer_times']
+            self.prayer_times_date = datetime.now().date()
+            logging.info(f"Loaded today's prayer times from cache: {self.prayer_times}")
+            return True
+        return False
+
     def wake_system(self):
         """Wake up the system from sleep mode."""
         try:
             # On macOS, we can use caffeinate to prevent sleep and wake the system
             if sys.platform == "darwin":
-                # This command will wake the system and keep it awake briefly
-                subprocess.run(['caffeinate', '-u', '-t', '10'], check=True)
+                # This command will wake the system and keep it awake briefly.
+                # -u asserts user activity immediately, so don't block for the
+                # 10 seconds caffeinate stays alive
+                subprocess.Popen(['caffeinate', '-u', '-t', '10'])
                 logging.info("System wake command executed (macOS)")
             elif sys.platform == "linux":
                 # On Linux, you might need different approaches depending on your setup
@@ -105,7 +243,7 @@ class EzanPlayer:
                 logging.info("System wake command executed (Linux)")
             elif sys.platform == "win32":
                 # On Windows, we can use powercfg
-                subprocess.run(['powercfg', '/WAKE'], check=True, shell=True)
+                subprocess.Popen(['powercfg', '/WAKE'], shell=True)
                 logging.info("System wake command executed (Windows)")
         except subprocess.CalledProcessError as e:
             logging.error(f"Failed to wake system: {e}")
@@ -121,10 +259,9 @@ class EzanPlayer:
                 return int(result.stdout.strip())
             elif sys.platform == "linux":
                 result = subprocess.run(['amixer', 'get', 'Master'], 
-                                      capture_output=True, text=True, check=True)
+                                      capture_output=True, check=True)
                 # Parse amixer output to get volume percentage
-                import re
-                match = re.search(r'\[(\d+)%\]', result.stdout)
+                match = _AMIXER_RE.search(result.stdout)
                 return int(match.group(1)) if match else 50
             elif sys.platform == "win32":
                 # Windows volume control would need additional setup
@@ -154,6 +291,28 @@ class EzanPlayer:
             logging.error(f"Failed to set volume to {volume_level}%: {e}")
             return False
         
+    def set_volume_repeated(self, volume_level, times=5, delay=0.1):
+        """Set system volume several times in a row with a single process.
+        
+        On macOS the repeat loop runs inside one osascript call instead of
+        forking osascript per attempt. amixer is idempotent, so Linux and
+        other platforms just set the volume once.
+        """
+        if sys.platform != "darwin":
+            return self.set_volume(volume_level)
+        try:
+            subprocess.run(['osascript',
+                            '-e', f'repeat {times} times',
+                            '-e', f'set volume output volume {volume_level}',
+                            '-e', f'delay {delay}',
+                            '-e', 'end repeat'],
+                           check=True)
+            logging.info(f"Volume set to {volume_level}% ({times}x)")
+            return True
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Failed to set volume to {volume_level}%: {e}")
+            return False
+        
     def restore_volume(self):
         """Restore original volume level."""
         if self.original_volume is not None:
@@ -161,130 +320,170 @@ class EzanPlayer:
             logging.info(f"Volume restored to original level: {self.original_volume}%")
             self.original_volume = None
     
+    def run_pending_restores(self):
+        """Restore the volume for any delayed restores that are now due."""
+        if not self._pending_restores:
+            return
+        now = time.time()
+        with self._restore_lock:
+            due = [volume for due_at, volume in self._pending_restores if due_at <= now]
+            self._pending_restores = [entry for entry in self._pending_restores if entry[0] > now]
+        for volume in due:
+            self.set_volume(volume)
+            logging.info(f"Volume restored to original level: {volume}%")
+            self.original_volume = None
+    
+    def next_restore_at(self):
+        """Timestamp of the earliest queued volume restore, or None."""
+        with self._restore_lock:
+            return min((due_at for due_at, _ in self._pending_restores), default=None)
+    
     def is_office_mode(self):
         """Check if office mode is enabled via dashboard config."""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                dashboard_config = config.get('dashboard', {})
-                return dashboard_config.get('mode', 'home') == 'office'
+            # Only re-read the file when the dashboard has written to it
+            mtime = os.path.getmtime(self.config_file)
+            if mtime != self._config_mtime:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    config = json_loads(f.read())
+                self._dashboard_cfg = config.get('dashboard', {})
+                self._config_mtime = mtime
+            return self._dashboard_cfg.get('mode', 'home') == 'office'
         except Exception as e:
             logging.error(f"Error checking office mode: {e}")
             return False  # Default to home mode if error
 
     def get_prayer_times(self):
-        """Fetch prayer times from official Diyanet website for Barcelona."""
+        """Fetch today's prayer times from official Diyanet website for Barcelona."""
+        today = datetime.now()
+        prayer_times = self.fetch_prayer_times(today)
+        if not prayer_times:
+            return False
+        self.prayer_times = prayer_times
+        self.prayer_times_date = today.date()
+        return True
+
+    def fetch_prayer_times(self, day):
+        """Fetch the prayer times for the given day, or None on failure."""
         try:
             # Official Diyanet prayer times website for Barcelona
             url = "https://namazvakitleri.diyanet.gov.tr/tr-TR/14262/barcelona-icin-namaz-vakti"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            # Default browser headers live on the session; only per-request
+            # conditional headers are added here
+            headers = {}
             
-            # Parse HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # The page holds the whole month's table, so the table rows cached
+            # this month can be revalidated with a conditional GET
+            month_key = day.strftime('%Y-%m')
+            cache = self.load_cache()
+            cached_page = cache.get('diyanet_page', {})
+            if cached_page.get('month') != month_key:
+                cached_page = {}
+            if cached_page.get('etag'):
+                headers['If-None-Match'] = cached_page['etag']
+            if cached_page.get('last_modified'):
+                headers['If-Modified-Since'] = cached_page['last_modified']
             
-            # Find the prayer times table
-            table = soup.find('table', class_='table')
-            if not table:
-                # Try alternative table selectors
-                table = soup.find('table')
+            # Stream the page into the parser instead of buffering the whole
+            # HTML document in memory
+            with self.session.get(url, headers=headers, timeout=15, stream=True) as response:
+                response.raise_for_status()
                 
-            if not table:
+                if response.status_code == 304 and cached_page.get('rows'):
+                    logging.info("Diyanet page not modified, using cached table")
+                    rows = cached_page['rows']
+                else:
+                    # Only trust the encoding if the server declared one; requests
+                    # otherwise guesses ISO-8859-1 for text/html, which would
+                    # override lxml's <meta charset> detection and garble Turkish
+                    encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '') else None
+                    rows = _stream_table_rows(response.iter_content(chunk_size=8192), encoding)
+                    cache['diyanet_page'] = {
+                        'month': month_key,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'rows': rows,
+                        'fetched_at': datetime.now().isoformat(timespec='seconds')
+                    }
+            
+            if not rows:
                 logging.error("Could not find prayer times table on Diyanet website")
-                return False
+                return None
             
-            # Get today's date in Turkish format
-            today = datetime.now()
-            
-            # Turkish month names mapping
-            turkish_months = {
-                'January': 'Ocak', 'February': 'Şubat', 'March': 'Mart',
-                'April': 'Nisan', 'May': 'Mayıs', 'June': 'Haziran',
-                'July': 'Temmuz', 'August': 'Ağustos', 'September': 'Eylül',
-                'October': 'Ekim', 'November': 'Kasım', 'December': 'Aralık'
-            }
+            # Get the requested date in Turkish format
+            today = day
             
             english_month = today.strftime('%B')
-            turkish_month = turkish_months.get(english_month, english_month)
+            turkish_month = TURKISH_MONTHS.get(english_month, english_month)
             today_day = str(today.day)
             today_year = str(today.year)
             
-            # Find today's row in the table
-            today_row = None
-            rows = table.find_all('tr')
+            # More robust date matching - check for exact patterns, built once
+            # and deduplicated so each row is a single startswith() call
+            expected_patterns = tuple(dict.fromkeys([
+                f"{today_day} {turkish_month} {today_year}",  # "26 Ekim 2025"
+                f"{today_day.zfill(2)} {turkish_month} {today_year}",  # "26 Ekim 2025" with zero padding
+                f"{today_day} {turkish_month[:4]} {today_year}",  # "26 Ekim 2025" with month abbreviation
+            ]))
             
+            # Find today's row in the table - cell text is whitespace-normalized,
+            # so the date starts the cell ("4 Ekim" no longer matches "14 Ekim")
+            texts = None
             for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 8:  # Should have 8 columns as we discovered
-                    date_cell = cells[0].get_text(strip=True)
-                    # More robust date matching - check for exact patterns
-                    expected_patterns = [
-                        f"{today_day} {turkish_month} {today_year}",  # "26 Ekim 2025"
-                        f"{today_day.zfill(2)} {turkish_month} {today_year}",  # "26 Ekim 2025" with zero padding
-                        f"{today_day} {turkish_month[:4]} {today_year}",  # "26 Ekim 2025" with month abbreviation
-                    ]
-                    
-                    # Check if any expected pattern matches
-                    date_match = any(pattern in date_cell for pattern in expected_patterns)
-                    
-                    if date_match:
-                        logging.info(f"Found matching date row: '{date_cell}'")
-                        today_row = row
-                        break
+                date_cell = row[0]
+                if date_cell.startswith(expected_patterns):
+                    logging.info(f"Found matching date row: '{date_cell}'")
+                    texts = row
+                    break
             
-            if not today_row:
+            if not texts:
                 expected_date = f"{today_day} {turkish_month} {today_year}"
                 logging.error(f"Could not find today's prayer times on Diyanet website for date: {expected_date}")
-                return False
-            
-            # Extract prayer times from the row
-            cells = today_row.find_all('td')
-            if len(cells) < 8:
-                logging.error("Invalid table structure - not enough columns")
-                return False
+                return None
             
             # Column order: Miladi Tarih, Hicri Tarih, İmsak, Güneş, Öğle, İkindi, Akşam, Yatsı
             try:
-                self.prayer_times = {
-                    'fajr': cells[2].get_text(strip=True),     # İmsak
-                    'dhuhr': cells[4].get_text(strip=True),    # Öğle  
-                    'asr': cells[5].get_text(strip=True),      # İkindi
-                    'maghrib': cells[6].get_text(strip=True),  # Akşam
-                    'isha': cells[7].get_text(strip=True)      # Yatsı
+                prayer_times = {
+                    'fajr': texts[2],     # İmsak
+                    'dhuhr': texts[4],    # Öğle  
+                    'asr': texts[5],      # İkindi
+                    'maghrib': texts[6],  # Akşam
+                    'isha': texts[7]      # Yatsı
                 }
                 
                 # Validate prayer times format (should be HH:MM)
-                for prayer, time_str in self.prayer_times.items():
-                    if not re.match(r'^\d{2}:\d{2}$', time_str):
+                for prayer, time_str in prayer_times.items():
+                    if not is_valid_time(time_str):
                         logging.error(f"Invalid time format for {prayer}: {time_str}")
-                        return False
+                        return None
                 
-                logging.info(f"Diyanet prayer times fetched: {self.prayer_times}")
-                return True
+                logging.info(f"Diyanet prayer times fetched for {today.strftime('%Y-%m-%d')}: {prayer_times}")
+                
+                # Remember today's times (and the revalidated page) for restarts
+                if today.date() == datetime.now().date():
+                    cache['date'] = today.strftime('%Y-%m-%d')
+                    cache['prayer_times'] = prayer_times
+                self.save_cache(cache)
+                return prayer_times
                 
             except (IndexError, AttributeError) as e:
                 logging.error(f"Error parsing prayer times from table: {e}")
-                return False
+                return None
                 
         except requests.RequestException as e:
             logging.error(f"Network error fetching Diyanet prayer times: {e}")
-            return False
+            return None
         except Exception as e:
             logging.error(f"Error fetching Diyanet prayer times: {e}")
-            return False
+            return None
 
     def play_ezan_video(self, prayer_name: str):
         """Play the appropriate ezan video for the given prayer with volume control."""
+        if self.skip_playback:
+            logging.info(f"Office mode active - skipping {prayer_name} ezan")
+            return
+        
         try:
             # Check if office mode is enabled
             if self.is_office_mode():
@@ -296,7 +495,7 @@ class EzanPlayer:
             self.wake_system()
             
             # Small delay to ensure system is awake
-            time.sleep(2)
+            time.sleep(0.2)
             
             video_url = self.youtube_videos.get(prayer_name.lower())
             if not video_url or 'YOUR_' in video_url:
@@ -315,19 +514,15 @@ class EzanPlayer:
             
             # CONSISTENT VOLUME - Set volume and keep it steady throughout ezan
             logging.info(f"Setting CONSISTENT VOLUME to {ezan_volume}% for {prayer_name} ezan")
-            for i in range(5):  # More attempts for instant effect
-                self.set_volume(ezan_volume)
-                time.sleep(0.1)  # Very short delay - almost instant
+            # More attempts for instant effect, very short delay - almost instant
+            self.set_volume_repeated(ezan_volume, times=5, delay=0.1)
             
             # Open YouTube video in default browser
             webbrowser.open(video_url)
             
-            # IMMEDIATELY set volume again - no waiting
-            self.set_volume(ezan_volume)
-            
-            # Set volume one more time after a tiny delay to catch browser audio
-            time.sleep(0.5)
-            self.set_volume(ezan_volume)
+            # IMMEDIATELY set volume again, then once more after a tiny delay
+            # to catch browser audio
+            self.set_volume_repeated(ezan_volume, times=2, delay=0.5)
             
             logging.info(f"Playing {prayer_name} ezan at CONSISTENT {ezan_volume}% volume: {video_url}")
             
@@ -337,14 +532,9 @@ class EzanPlayer:
                 # Wait longer before restoring to avoid volume changes during ezan
                 restore_delay = 300  # 5 minutes - well after ezan finishes
                 
-                # Use threading to restore volume after delay without blocking
-                def delayed_restore():
-                    time.sleep(restore_delay)
-                    self.restore_volume()
-                
-                restore_thread = threading.Thread(target=delayed_restore)
-                restore_thread.daemon = True
-                restore_thread.start()
+                # Queue the restore for the main loop instead of blocking
+                with self._restore_lock:
+                    self._pending_restores.append((time.time() + restore_delay, self.original_volume))
                 
                 logging.info(f"Volume will be restored to {self.original_volume}% in {restore_delay} seconds (after ezan completes)")
             
@@ -358,31 +548,73 @@ class EzanPlayer:
             if hasattr(self, 'original_volume') and self.original_volume is not None:
                 self.restore_volume()
 
+    def schedule_at(self, when, callback, kind='job', label=''):
+        """Queue a one-shot callback to run at the given datetime."""
+        heapq.heappush(self._heap, (when.timestamp(), next(self._job_seq), kind, label, callback))
+
+    def schedule_daily(self, at, callback):
+        """Queue a callback to run every day at the given HH:MM time."""
+        hour, minute = at.split(':', 1)
+        now = datetime.now()
+        when = datetime.combine(now.date(), dt_time(int(hour), int(minute)))
+        if when <= now:
+            when += timedelta(days=1)
+        
+        def run_and_requeue():
+            try:
+                callback()
+            finally:
+                self.schedule_daily(at, callback)
+        
+        self.schedule_at(when, run_and_requeue, kind='daily', label=callback.__name__)
+
+    def run_pending(self):
+        """Run every queued job that is due."""
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            job = heapq.heappop(self._heap)
+            job[-1]()
+
+    def idle_seconds(self):
+        """Seconds until the next queued job, or None if nothing is queued."""
+        if not self._heap:
+            return None
+        return self._heap[0][0] - time.time()
+
+    def upcoming_jobs(self):
+        """List queued jobs as (run datetime, kind, label), soonest first."""
+        return [(datetime.fromtimestamp(due_at), kind, label)
+                for due_at, _, kind, label, _ in sorted(self._heap)]
+
     def schedule_prayers(self):
         """Schedule ezan videos for today's prayer times."""
         if not self.prayer_times:
             logging.error("No prayer times available for scheduling")
             return
             
-        # Clear only prayer jobs, keep daily update job
-        jobs_to_remove = []
-        for job in schedule.jobs:
-            if job.job_func.__name__ == 'play_ezan_video':
-                jobs_to_remove.append(job)
+        # Clear only prayer jobs, keep daily update jobs
+        self._heap = [job for job in self._heap if job[2] != 'prayer']
+        heapq.heapify(self._heap)
         
-        for job in jobs_to_remove:
-            schedule.cancel_job(job)
+        # Sample the clock once for the whole batch
+        now = datetime.now()
+        today = now.date()
         
         for prayer_name, prayer_time in self.prayer_times.items():
             if prayer_time and prayer_time != '':
                 try:
-                    # Convert prayer time to datetime
-                    today = datetime.now().date()
-                    prayer_datetime = datetime.strptime(f"{today} {prayer_time}", "%Y-%m-%d %H:%M")
+                    # Convert prayer time to datetime (times are validated as HH:MM on fetch)
+                    prayer_clock = self._time_cache.get(prayer_time)
+                    if prayer_clock is None:
+                        hour, minute = prayer_time.split(':', 1)
+                        prayer_clock = dt_time(int(hour), int(minute))
+                        self._time_cache[prayer_time] = prayer_clock
+                    prayer_datetime = datetime.combine(today, prayer_clock)
                     
                     # Only schedule if the prayer time hasn't passed today
-                    if prayer_datetime > datetime.now():
-                        schedule.every().day.at(prayer_time).do(self.play_ezan_video, prayer_name)
+                    if prayer_datetime > now:
+                        self.schedule_at(prayer_datetime, functools.partial(self.play_ezan_video, prayer_name),
+                                         kind='prayer', label=prayer_name)
                         logging.info(f"Scheduled {prayer_name} ezan at {prayer_time}")
                     else:
                         logging.info(f"Skipped {prayer_name} at {prayer_time} (already passed today)")
@@ -390,12 +622,38 @@ class EzanPlayer:
                 except ValueError as e:
                     logging.error(f"Error parsing time for {prayer_name}: {prayer_time} - {e}")
 
+    def prefetch_tomorrow(self):
+        """Fetch tomorrow's prayer times ahead of midnight into a staging slot."""
+        tomorrow = datetime.now() + timedelta(days=1)
+        logging.info(f"🕐 Prefetching prayer times for {tomorrow.strftime('%Y-%m-%d')}...")
+        
+        prayer_times = self.fetch_prayer_times(tomorrow)
+        if prayer_times:
+            self._pending_prayer_times = (tomorrow.strftime('%Y-%m-%d'), prayer_times)
+        else:
+            self._pending_prayer_times = None
+            logging.warning("🕐 Prefetch failed, the daily update will fetch at midnight")
+
     def run_daily_update(self):
-        """Daily task to fetch new prayer times and reschedule."""
+        """Daily task to swap in prefetched (or fetch new) prayer times and reschedule."""
         logging.info("🕐 Running daily prayer times update...")
         logging.info(f"🕐 Current date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        if self.get_prayer_times():
+        today_key = datetime.now().strftime('%Y-%m-%d')
+        pending = self._pending_prayer_times
+        self._pending_prayer_times = None
+        
+        if pending and pending[0] == today_key:
+            self.prayer_times = pending[1]
+            self.prayer_times_date = datetime.now().date()
+            cache = self.load_cache()
+            cache['date'] = today_key
+            cache['prayer_times'] = self.prayer_times
+            self.save_cache(cache)
+            logging.info(f"🕐 Using prefetched prayer times: {self.prayer_times}")
+            self.schedule_prayers()
+            logging.info("🕐 Daily update completed successfully")
+        elif self.get_prayer_times():
             logging.info(f"🕐 New prayer times fetched: {self.prayer_times}")
             self.schedule_prayers()
             logging.info("🕐 Daily update completed successfully")
@@ -406,8 +664,11 @@ class EzanPlayer:
         """Main application loop."""
         logging.info("Starting Ezan Player...")
         
-        # Initial setup - try to get prayer times, but don't exit if it fails
-        if not self.get_prayer_times():
+        # Initial setup - reuse today's cached times or try to get prayer times,
+        # but don't exit if it fails
+        if self.prayer_times:
+            logging.info("Using today's cached prayer times, skipping fetch")
+        elif not self.get_prayer_times():
             logging.error("Failed to fetch initial prayer times. Using fallback times...")
             # Use fallback prayer times based on approximate Barcelona times
             self.prayer_times = {
@@ -421,16 +682,27 @@ class EzanPlayer:
             
         self.schedule_prayers()
         
-        # Schedule daily updates at midnight
-        schedule.every().day.at("00:01").do(self.run_daily_update)
-        logging.info("🕐 Daily update scheduled for 00:01 every day")
+        # Prefetch tomorrow's times before midnight, swap them in at midnight
+        self.schedule_daily("23:50", self.prefetch_tomorrow)
+        self.schedule_daily("00:00", self.run_daily_update)
+        logging.info("🕐 Prefetch scheduled for 23:50 and daily update for 00:00 every day")
         
         logging.info("Ezan Player is running. Press Ctrl+C to stop.")
         
         try:
             while True:
-                schedule.run_pending()
-                time.sleep(30)  # Check every 30 seconds
+                self.run_pending()
+                self.run_pending_restores()
+                # Sleep until the next job is due instead of polling, but at most
+                # MAX_IDLE_SLEEP: time.sleep doesn't count system sleep, so a long
+                # nap would fire overdue prayers late after the Mac wakes up
+                idle = self.idle_seconds()
+                if idle is None:
+                    idle = MAX_IDLE_SLEEP
+                restore_at = self.next_restore_at()
+                if restore_at is not None:
+                    idle = min(idle, restore_at - time.time())
+                time.sleep(max(0, min(idle, MAX_IDLE_SLEEP)))
                 
         except KeyboardInterrupt:
             logging.info("Ezan Player stopped by user")
@@ -5,9 +5,7 @@ Easily start the web dashboard
 """
 
 import sys
-import subprocess
 import webbrowser
-import time
 import threading
 import os
 
@@ -21,40 +19,34 @@ def start_dashboard():
     os.chdir(script_dir)
     
     try:
-        # Start the dashboard server
-        process = subprocess.Popen([
-            sys.executable, 'web_dashboard.py'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        
-        # Wait a moment for the server to start
-        time.sleep(3)
-        
-        # Try to open the browser
-        dashboard_url = "http://localhost:8080"
-        print(f"🚀 Opening dashboard at: {dashboard_url}")
-        webbrowser.open(dashboard_url)
-        
-        print(f"✅ Dashboard is running!")
-        print(f"📱 Access from any device: {dashboard_url}")
-        print(f"🛑 Press Ctrl+C to stop the dashboard")
-        print("=" * 50)
-        
-        # Wait for the process to complete (or be interrupted)
-        try:
-            process.wait()
-        except KeyboardInterrupt:
-            print(f"\n🛑 Stopping dashboard...")
-            process.terminate()
-            process.wait()
-            print(f"✅ Dashboard stopped!")
-            
-    except FileNotFoundError:
-        print("❌ Error: web_dashboard.py not found!")
+        # Run the dashboard server in this process instead of spawning a
+        # second Python interpreter
+        import web_dashboard
+    except ImportError as e:
+        print(f"❌ Error: could not load web_dashboard.py: {e}")
         print("Make sure you're in the correct directory.")
         sys.exit(1)
+    
+    web_dashboard.load_dashboard_config()
+    dashboard_url = f"http://localhost:{web_dashboard.dashboard_config.get('port', 8080)}"
+    
+    # Open the browser once the server has had a moment to bind
+    print(f"🚀 Opening dashboard at: {dashboard_url}")
+    threading.Timer(1.0, webbrowser.open, args=[dashboard_url]).start()
+    
+    print(f"✅ Dashboard is running!")
+    print(f"📱 Access from any device: {dashboard_url}")
+    print(f"🛑 Press Ctrl+C to stop the dashboard")
+    print("=" * 50)
+    
+    try:
+        web_dashboard.main()
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
         print(f"❌ Error starting dashboard: {e}")
         sys.exit(1)
+    print(f"\n✅ Dashboard stopped!")
 
 if __name__ == "__main__":
     start_dashboard()
@@ -6,15 +6,18 @@ Use this to verify your setup and configuration.
 
 import json
 import sys
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
 from datetime import datetime
-from ezan_player import EzanPlayer
 
 def test_config_file():
     """Test if configuration file exists and is valid."""
     print("🔧 Testing configuration file...")
     try:
-        with open('ezan_config.json', 'r') as f:
-            config = json.load(f)
+        with open('ezan_config.json', 'r', encoding='utf-8') as f:
+            config = orjson.loads(f.read()) if orjson else json.load(f)
         
         videos = config.get('youtube_videos', {})
         required_prayers = ['fajr', 'dhuhr', 'asr', 'maghrib', 'isha']
@@ -46,6 +49,8 @@ def test_prayer_times_api():
     """Test fetching prayer times from Diyanet API."""
     print("\n🕰️ Testing prayer times API...")
     
+    from ezan_player import EzanPlayer  # Imported lazily, only needed by player tests
+    
     player = EzanPlayer()
     success = player.get_prayer_times()
     
@@ -84,6 +89,8 @@ def test_system_wake():
     """Test system wake functionality."""
     print("\n💤 Testing system wake functionality...")
     
+    from ezan_player import EzanPlayer
+    
     player = EzanPlayer()
     try:
         player.wake_system()
@@ -99,6 +106,8 @@ def test_scheduling():
     """Test prayer time scheduling."""
     print("\n⏰ Testing scheduling functionality...")
     
+    from ezan_player import EzanPlayer
+    
     player = EzanPlayer()
     if not player.get_prayer_times():
         print("❌ Cannot test scheduling without prayer times")
@@ -109,13 +118,12 @@ def test_scheduling():
         print("✅ Prayer scheduling test successful!")
         
         # Check if any prayers are scheduled for today
-        import schedule
-        jobs = schedule.jobs
+        jobs = [job for job in player.upcoming_jobs() if job[1] == 'prayer']
         
         if jobs:
             print(f"📅 {len(jobs)} prayer(s) scheduled for today:")
-            for job in jobs:
-                print(f"   Next run: {job.next_run}")
+            for next_run, _, prayer in jobs:
+                print(f"   {prayer.capitalize()} next run: {next_run}")
         else:
             print("ℹ️  No prayers scheduled (may be because all prayer times have passed today)")
         
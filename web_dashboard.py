@@ -4,25 +4,65 @@ Ezan Player Web Dashboard
 A beautiful web interface to control your Ezan Player
 """
 
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from flask import Flask, Response, render_template, jsonify, request, send_from_directory
 from flask_cors import CORS
-import json
+from flask.json.provider import DefaultJSONProvider
 import subprocess
+import psutil
 import sys
 import os
+import re
 from datetime import datetime, timedelta
 import threading
 import time
+import bisect
+import hashlib
 import logging
-from ezan_player import EzanPlayer
+from ezan_player import EzanPlayer, orjson, json_loads, json_dumps
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    from waitress import serve  # Optional: threaded production WSGI server
+except ImportError:
+    serve = None
+
+# Logging is configured by ezan_player on import, so dashboard actions
+# land in ezan_player.log alongside the player's own messages
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for faster API responses."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Let browsers keep static assets for a day instead of revalidating them
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
 CORS(app)
 
+# Static filenames carrying a content hash, e.g. app.3f9c2a1b.js
+_VERSIONED_ASSET_RE = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+
+@app.after_request
+def cache_static_assets(response):
+    """Mark versioned static assets as immutable so browsers skip revalidation.
+    
+    Unversioned files keep the plain SEND_FILE_MAX_AGE_DEFAULT caching, so a
+    reload still picks up changes to them.
+    """
+    if (request.path.startswith(f"{app.static_url_path}/") and response.status_code == 200
+            and ('v' in request.args or _VERSIONED_ASSET_RE.search(request.path))):
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        response.cache_control.immutable = True
+    return response
+
 # Global ezan player instance
 ezan_player = None
 dashboard_config = {
@@ -31,115 +71,364 @@ dashboard_config = {
     'auto_refresh': True
 }
 
+CONFIG_FILE = 'ezan_config.json'
+# WiFi lookup uses macOS' private airport tool, so it is only available there
+_IS_DARWIN = sys.platform == "darwin"
+_AIRPORT = '/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport' if _IS_DARWIN else None
+LAUNCH_AGENT_PLIST = os.path.expanduser('~/Library/LaunchAgents/com.ezanplayer.plist')
+
+# Short-lived caches for the subprocess-backed status lookups (seconds)
+STATUS_CACHE_TTL = 2
+WIFI_CACHE_TTL = 30
+_status_cache = {'t': 0, 'val': None}
+_wifi_cache = {'t': 0, 'val': None}
+
+# Status stream: how often to check for changes (seconds)
+STREAM_INTERVAL = 1
+# Streams rescan the process table at the old 30s polling cadence instead
+# of every STATUS_CACHE_TTL, since they build the status every second
+STREAM_STATUS_TTL = 30
+# Each open stream holds a server thread, so cap them and size the pool to
+# leave SERVER_THREADS free for regular requests
+MAX_STREAMS = 4
+SERVER_THREADS = 8
+_stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+# Today's prayer times, so status polls don't refetch them from Diyanet
+_prayer_cache = {'date': None, 'times': None, 'schedule': [], 'seconds': [], 'failed_at': None}
+# Wait this long (seconds) after a failed fetch before trying Diyanet again
+PRAYER_RETRY_DELAY = 300
+_prayer_refresh_timer = None
+_prayer_lock = threading.Lock()  # one refresh at a time across server threads and the timer
+
+# Timer running the player's queued volume restores after test playback
+_restore_timer = None
+_restore_timer_lock = threading.Lock()
+
+# Parsed config file, keyed by the file's mtime so unchanged files aren't re-read
+_config_cache = {'mtime': 0, 'data': None}
+_config_lock = threading.RLock()  # serializes config mutations across server threads
+
+# Delay (seconds) before debounced config changes are flushed to disk
+CONFIG_FLUSH_DELAY = 0.5
+_flush_timer = None
+
+def _load_config():
+    """Return the parsed config file, re-reading it only when it changed on disk."""
+    mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    if _config_cache['data'] is None or mtime != _config_cache['mtime']:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            _config_cache['data'] = json_loads(f.read())
+        _config_cache['mtime'] = mtime
+    return _config_cache['data']
+
+def _write_config(config):
+    """Write the config file and record its mtime so the next read is a no-op."""
+    with _config_lock:
+        try:
+            # Write to a temp file and rename so readers never see a partial file
+            tmp_file = f"{CONFIG_FILE}.tmp"
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, json_dumps(config, indent=True).encode('utf-8'))
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, CONFIG_FILE)
+        except Exception:
+            # Disk and cache may now disagree, force a re-read next time
+            _config_cache['data'] = None
+            raise
+        _config_cache['data'] = config
+        _config_cache['mtime'] = os.stat(CONFIG_FILE).st_mtime_ns
+
+def _flush_config():
+    """Write pending in-memory config changes to disk."""
+    config = _config_cache['data']
+    if config is None:
+        return
+    try:
+        _write_config(config)
+    except Exception as e:
+        logger.error(f"Failed to write config: {e}")
+
+def _schedule_flush():
+    """Debounce config writes so rapid successive changes coalesce into one."""
+    global _flush_timer
+    
+    if _flush_timer is not None:
+        _flush_timer.cancel()
+    _flush_timer = threading.Timer(CONFIG_FLUSH_DELAY, _flush_config)
+    _flush_timer.daemon = True
+    _flush_timer.start()
+
+def _mutate_config(mutator, debounce=False):
+    """Apply `mutator` to the cached config and persist it - the single config write path.
+    
+    `mutator` changes the config dict in place and returns True if anything
+    changed; unchanged configs aren't written. With `debounce` the write is
+    deferred so rapid successive changes coalesce into one.
+    """
+    with _config_lock:
+        config = _load_config()
+        if not mutator(config):
+            return
+        if debounce:
+            _schedule_flush()
+        else:
+            _write_config(config)
+
 def load_dashboard_config():
-    """Load dashboard configuration."""
-    global dashboard_config
+    """Load dashboard configuration and create the shared ezan player."""
+    global ezan_player, dashboard_config
     try:
-        with open('ezan_config.json', 'r') as f:
-            config = json.load(f)
-            dashboard_config.update(config.get('dashboard', {}))
+        dashboard_config.update(_load_config().get('dashboard', {}))
     except:
         pass
+    
+    # Created up front so the first status request doesn't pay for it
+    if ezan_player is None:
+        ezan_player = EzanPlayer()
+    ezan_player.skip_playback = (dashboard_config.get('mode') == 'office')
+
+@app.before_request
+def ensure_player():
+    """Create the player on first request when served without main() (e.g. gunicorn)."""
+    if ezan_player is None:
+        with _config_lock:
+            if ezan_player is None:
+                load_dashboard_config()
 
 def save_dashboard_config():
     """Save dashboard configuration."""
+    def apply(config):
+        if config.get('dashboard') == dashboard_config:
+            return False
+        config['dashboard'] = dict(dashboard_config)
+        return True
+    
     try:
-        with open('ezan_config.json', 'r') as f:
-            config = json.load(f)
-        
-        config['dashboard'] = dashboard_config
-        
-        with open('ezan_config.json', 'w') as f:
-            json.dump(config, f, indent=2)
+        _mutate_config(apply)
     except Exception as e:
         logger.error(f"Failed to save dashboard config: {e}")
 
-def get_system_status():
-    """Get current system status."""
+def get_system_status(max_age=STATUS_CACHE_TTL):
+    """Get current system status, reusing a cached result up to `max_age` seconds old."""
+    if _status_cache['val'] is not None and time.monotonic() - _status_cache['t'] < max_age:
+        return _status_cache['val']
     try:
-        # Check if service is running
-        result = subprocess.run(['launchctl', 'list'], capture_output=True, text=True)
-        service_running = 'com.ezanplayer' in result.stdout
-        
-        # Get process info
-        result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-        process_lines = [line for line in result.stdout.split('\n') if 'ezan_player.py' in line]
-        
+        # Get process info straight from the OS process table
         process_info = None
-        if process_lines:
-            parts = process_lines[0].split()
-            process_info = {
-                'pid': parts[1],
-                'cpu': parts[2],
-                'memory': parts[3],
-                'start_time': parts[8]
-            }
+        for proc in psutil.process_iter(['pid', 'cmdline', 'cpu_percent', 'memory_percent', 'create_time']):
+            if any('ezan_player.py' in arg for arg in (proc.info['cmdline'] or [])):
+                process_info = {
+                    'pid': str(proc.info['pid']),
+                    'cpu': f"{proc.info['cpu_percent'] or 0:.1f}",
+                    'memory': f"{proc.info['memory_percent'] or 0:.1f}",
+                    'start_time': datetime.fromtimestamp(proc.info['create_time']).strftime('%H:%M')
+                }
+                break
+        
+        # The service is running if its Launch Agent is installed and the
+        # player process is alive - no need to fork launchctl for that
+        service_running = os.path.exists(LAUNCH_AGENT_PLIST) and process_info is not None
         
-        return {
+        status = {
             'service_running': service_running,
-            'process_info': process_info,
-            'timestamp': datetime.now().strftime('%H:%M:%S')
+            'process_info': process_info
         }
+        _status_cache['t'] = time.monotonic()
+        _status_cache['val'] = status
+        return status
     except Exception as e:
         logger.error(f"Error getting system status: {e}")
         return {'error': str(e)}
 
 def get_current_wifi():
-    """Get current WiFi network name."""
-    try:
-        if sys.platform == "darwin":
-            result = subprocess.run([
-                '/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport', 
-                '-I'
-            ], capture_output=True, text=True)
-            
-            for line in result.stdout.split('\n'):
-                if 'SSID' in line and 'BSSID' not in line:
-                    return line.split(':')[1].strip()
+    """Get current WiFi network name, cached since the SSID rarely changes."""
+    if _wifi_cache['val'] is not None and time.monotonic() - _wifi_cache['t'] < WIFI_CACHE_TTL:
+        return _wifi_cache['val']
+    if not _IS_DARWIN:
         return "Unknown"
+    network = "Unknown"
+    try:
+        result = subprocess.run([_AIRPORT, '-I'], capture_output=True, text=True)
+        
+        for line in result.stdout.split('\n'):
+            if 'SSID' in line and 'BSSID' not in line:
+                network = line.split(':')[1].strip()
+                break
     except:
-        return "Unknown"
+        pass
+    _wifi_cache['t'] = time.monotonic()
+    _wifi_cache['val'] = network
+    return network
+
+def _prayer_refresh_due():
+    """True if the cached times are stale and no failed fetch is backing off."""
+    if _prayer_cache['date'] == datetime.now().date():
+        return False
+    failed_at = _prayer_cache['failed_at']
+    return failed_at is None or time.monotonic() - failed_at >= PRAYER_RETRY_DELAY
+
+def refresh_prayer_times():
+    """Fetch today's prayer times into the cache and re-arm the midnight refresh."""
+    with _prayer_lock:
+        # Another thread may have refreshed (or failed to) while we waited
+        if _prayer_refresh_due():
+            today = datetime.now().date()
+            # The player may already hold today's times (e.g. from its cache file)
+            if not (ezan_player.prayer_times and ezan_player.prayer_times_date == today):
+                ezan_player.get_prayer_times()
+            
+            if ezan_player.prayer_times_date == today:
+                _prayer_cache['date'] = today
+                _prayer_cache['times'] = dict(ezan_player.prayer_times)
+                # (seconds since midnight, name, "HH:MM"), sorted for bisecting
+                _prayer_cache['schedule'] = sorted(
+                    (int(time_str[:2]) * 3600 + int(time_str[3:5]) * 60, prayer, time_str)
+                    for prayer, time_str in _prayer_cache['times'].items()
+                )
+                _prayer_cache['seconds'] = [entry[0] for entry in _prayer_cache['schedule']]
+                _prayer_cache['failed_at'] = None
+            else:
+                _prayer_cache['failed_at'] = time.monotonic()
+        _schedule_prayer_refresh()
+
+def _schedule_prayer_refresh():
+    """Refresh the prayer times shortly after the next midnight."""
+    global _prayer_refresh_timer
+    
+    if _prayer_refresh_timer is not None:
+        _prayer_refresh_timer.cancel()
+    midnight = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+    delay = (midnight - datetime.now()).total_seconds() + 5
+    _prayer_refresh_timer = threading.Timer(delay, refresh_prayer_times)
+    _prayer_refresh_timer.daemon = True
+    _prayer_refresh_timer.start()
+
+def get_cached_prayer_times():
+    """Get today's prayer times, only hitting Diyanet when the cache is stale.
+    
+    After a failed fetch the last known times are served until
+    PRAYER_RETRY_DELAY has passed, so polls don't hammer Diyanet.
+    """
+    if _prayer_refresh_due():
+        refresh_prayer_times()
+    return _prayer_cache['times'] or {}
+
+def _tail_lines(path, count, chunk_size=4096):
+    """Read the last `count` lines of a file by seeking backwards from the end."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        # One extra newline guarantees the first kept line is complete
+        while pos > 0 and data.count(b'\n') <= count:
+            read_size = min(chunk_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines(keepends=True)[-count:]]
+
+def _schedule_volume_restore():
+    """Arm the restore timer for the earliest volume restore queued by test playback.
+    
+    The dashboard has no scheduler loop, so a single timer stands in for it
+    and re-arms itself while restores are still queued.
+    """
+    global _restore_timer
+    
+    with _restore_timer_lock:
+        if _restore_timer is not None:
+            _restore_timer.cancel()
+            _restore_timer = None
+        restore_at = ezan_player.next_restore_at()
+        if restore_at is None:
+            return
+        _restore_timer = threading.Timer(max(0, restore_at - time.time()), _run_volume_restores)
+        _restore_timer.daemon = True
+        _restore_timer.start()
+
+def _run_volume_restores():
+    """Restore the volume for due test playbacks, then wait for the next one."""
+    ezan_player.run_pending_restores()
+    _schedule_volume_restore()
 
 @app.route('/')
 def dashboard():
     """Main dashboard page."""
     return render_template('dashboard.html')
 
-@app.route('/api/status')
-def api_status():
-    """Get current status."""
-    global ezan_player, dashboard_config
+def build_status(status_max_age=STATUS_CACHE_TTL):
+    """Build the dashboard status payload.
     
-    if not ezan_player:
-        ezan_player = EzanPlayer()
-    
-    # Get prayer times
-    prayer_times = {}
+    The clock and the countdown to the next prayer are left to the browser,
+    so the payload only changes when the status itself does.
+    """
+    # Get prayer times (fetched at most once per day)
+    prayer_times = get_cached_prayer_times()
     next_prayer = None
-    if ezan_player.get_prayer_times():
-        prayer_times = ezan_player.prayer_times
-        
-        # Find next prayer
-        current_time = datetime.now().time()
-        for prayer, time_str in prayer_times.items():
-            prayer_time = datetime.strptime(time_str, '%H:%M').time()
-            if prayer_time > current_time:
-                next_prayer = {
-                    'name': prayer.capitalize(),
-                    'time': time_str,
-                    'countdown': str(datetime.combine(datetime.now().date(), prayer_time) - datetime.now()).split('.')[0]
-                }
-                break
+    now = datetime.now()
+    if prayer_times:
+        # Find next prayer in the time-sorted schedule
+        now_seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+        idx = bisect.bisect_right(_prayer_cache['seconds'], now_seconds)
+        if idx < len(_prayer_cache['schedule']):
+            _, prayer, time_str = _prayer_cache['schedule'][idx]
+            next_prayer = {
+                'name': prayer.capitalize(),
+                'time': time_str
+            }
     
-    return jsonify({
+    return {
         'mode': dashboard_config['mode'],
         'volume': ezan_player.audio_settings.get('ezan_volume', 75),
         'prayer_times': prayer_times,
         'next_prayer': next_prayer,
-        'system_status': get_system_status(),
-        'wifi_network': get_current_wifi(),
-        'current_time': datetime.now().strftime('%H:%M:%S')
-    })
+        'system_status': get_system_status(status_max_age),
+        'wifi_network': get_current_wifi()
+    }
+
+@app.route('/api/status')
+def api_status():
+    """Get current status."""
+    status = build_status()
+    
+    # Weak ETag over the payload, which only changes with the status (the
+    # clock ticks in the browser), so unchanged polls get an empty 304
+    etag = hashlib.blake2b(json_dumps(status).encode('utf-8'), digest_size=8).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(status)
+    response.set_etag(etag, weak=True)
+    return response
+
+@app.route('/api/stream')
+def api_stream():
+    """Push status to the dashboard as server-sent events whenever it changes."""
+    # Beyond MAX_STREAMS the dashboard falls back to polling /api/status
+    if not _stream_slots.acquire(blocking=False):
+        return Response(status=503)
+    
+    def generate():
+        last_status = None
+        while True:
+            status = build_status(STREAM_STATUS_TTL)
+            if status != last_status:
+                # Same encoder as /api/status, so both paths order keys alike
+                yield f"data: {app.json.dumps(status)}\n\n"
+                last_status = status
+            else:
+                # SSE comment, ignored by the browser; writing something every
+                # interval lets the server notice a closed tab within a second
+                yield ": keepalive\n\n"
+            time.sleep(STREAM_INTERVAL)
+    
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(_stream_slots.release)
+    return response
 
 @app.route('/api/toggle_mode', methods=['POST'])
 def toggle_mode():
@@ -153,6 +442,8 @@ def toggle_mode():
     dashboard_config['mode'] = new_mode
     save_dashboard_config()
     
+    ezan_player.skip_playback = (new_mode == 'office')
+    
     # Enhanced logging for visibility
     mode_emoji = "🏠" if new_mode == 'home' else "🏢"
     status_msg = "Ezan ENABLED" if new_mode == 'home' else "Ezan DISABLED"
@@ -160,36 +451,25 @@ def toggle_mode():
     logger.info(f"🎮 DASHBOARD: Mode switched from {old_mode.upper()} to {new_mode.upper()} {mode_emoji}")
     logger.info(f"🎮 DASHBOARD: {status_msg} - prayers will {'play normally' if new_mode == 'home' else 'be skipped'}")
     
-    # Also write to ezan player log for visibility
-    try:
-        with open('ezan_player.log', 'a', encoding='utf-8') as f:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]
-            f.write(f"{timestamp} - INFO - 🎮 DASHBOARD: Mode changed to {new_mode.upper()} {mode_emoji} ({status_msg})\n")
-    except:
-        pass
-    
     return jsonify({'success': True, 'mode': new_mode})
 
 @app.route('/api/set_volume', methods=['POST'])
 def set_volume():
     """Set ezan volume."""
-    global ezan_player
-    
-    if not ezan_player:
-        ezan_player = EzanPlayer()
-    
     data = request.get_json()
     volume = int(data.get('volume', 75))
     
-    # Update config file
+    # Update the cached config now, the file write is debounced so dragging
+    # the volume slider doesn't rewrite the file on every tick
+    def apply(config):
+        audio_settings = config.setdefault('audio_settings', {})
+        if audio_settings.get('ezan_volume') == volume:
+            return False
+        audio_settings['ezan_volume'] = volume
+        return True
+    
     try:
-        with open('ezan_config.json', 'r') as f:
-            config = json.load(f)
-        
-        config['audio_settings']['ezan_volume'] = volume
-        
-        with open('ezan_config.json', 'w') as f:
-            json.dump(config, f, indent=2)
+        _mutate_config(apply, debounce=True)
         
         # Update in-memory settings
         ezan_player.audio_settings['ezan_volume'] = volume
@@ -197,14 +477,6 @@ def set_volume():
         # Enhanced logging for visibility
         logger.info(f"🔊 DASHBOARD: Ezan volume changed to {volume}%")
         
-        # Also write to ezan player log for visibility
-        try:
-            with open('ezan_player.log', 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]
-                f.write(f"{timestamp} - INFO - 🔊 DASHBOARD: Ezan volume set to {volume}%\n")
-        except:
-            pass
-        
         return jsonify({'success': True, 'volume': volume})
     
     except Exception as e:
@@ -214,32 +486,22 @@ def set_volume():
 @app.route('/api/play_test', methods=['POST'])
 def play_test():
     """Play test ezan."""
-    global ezan_player, dashboard_config
+    global dashboard_config
     
     # Don't play if in office mode
     if dashboard_config['mode'] == 'office':
         return jsonify({'success': False, 'message': 'Office mode active - ezan disabled'})
     
-    if not ezan_player:
-        ezan_player = EzanPlayer()
-    
     data = request.get_json()
     prayer = data.get('prayer', 'fajr')
     
     try:
         ezan_player.play_ezan_video(prayer)
+        _schedule_volume_restore()
         
         # Enhanced logging for visibility  
         logger.info(f"🎵 DASHBOARD: Manual test - {prayer.upper()} ezan played")
         
-        # Also write to ezan player log for visibility
-        try:
-            with open('ezan_player.log', 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]
-                f.write(f"{timestamp} - INFO - 🎵 DASHBOARD: Manual test - {prayer.upper()} ezan played\n")
-        except:
-            pass
-            
         return jsonify({'success': True, 'message': f'{prayer.capitalize()} ezan played'})
     except Exception as e:
         logger.error(f"Failed to play test ezan: {e}")
@@ -249,10 +511,9 @@ def play_test():
 def restart_service():
     """Restart the ezan service."""
     try:
-        subprocess.run(['launchctl', 'unload', os.path.expanduser('~/Library/LaunchAgents/com.ezanplayer.plist')], 
-                      check=False)
-        time.sleep(1)
-        subprocess.run(['launchctl', 'load', os.path.expanduser('~/Library/LaunchAgents/com.ezanplayer.plist')], 
+        # kickstart -k kills and restarts the job in one launchd call, no
+        # unload/load race or artificial sleep needed
+        subprocess.run(['launchctl', 'kickstart', '-k', f'gui/{os.getuid()}/com.ezanplayer'], 
                       check=True)
         
         logger.info("Service restarted successfully")
@@ -270,39 +531,27 @@ def get_logs():
         
         for log_file in log_files:
             if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    logs.extend(lines[-20:])  # Get last 20 lines
+                logs.extend(_tail_lines(log_file, 20))  # Get last 20 lines
                 break
         
         return jsonify({'logs': logs})
     except Exception as e:
         return jsonify({'logs': [f'Error reading logs: {e}']})
 
-if __name__ == '__main__':
+def main():
+    """Start the dashboard server."""
     load_dashboard_config()
     
-    # Override ezan playback based on mode
-    original_play_ezan_video = None
-    
-    def mode_aware_play_ezan_video(self, prayer_name):
-        """Play ezan only if in home mode."""
-        global dashboard_config
-        
-        if dashboard_config['mode'] == 'office':
-            logger.info(f"Office mode active - skipping {prayer_name} ezan")
-            return
-        
-        # Call original method
-        return original_play_ezan_video(self, prayer_name)
-    
-    # Monkey patch the EzanPlayer class
-    if 'ezan_player' in sys.modules:
-        original_play_ezan_video = sys.modules['ezan_player'].EzanPlayer.play_ezan_video
-        sys.modules['ezan_player'].EzanPlayer.play_ezan_video = mode_aware_play_ezan_video
-    
     port = dashboard_config.get('port', 8080)
     print(f"🌐 Ezan Player Dashboard starting on http://localhost:{port}")
     print(f"🎯 Open your browser to control your ezan player!")
     
-    app.run(host='0.0.0.0', port=port, debug=False)
+    if serve is not None:
+        # Thread pool so a slow request doesn't block the rest of the dashboard,
+        # with room for the status streams on top
+        serve(app, host='0.0.0.0', port=port, threads=SERVER_THREADS + MAX_STREAMS)
+    else:
+        app.run(host='0.0.0.0', port=port, debug=False)
+
+if __name__ == '__main__':
+    main()